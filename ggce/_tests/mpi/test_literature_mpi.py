@@ -311,6 +311,14 @@ def test_prb_82_085116_2010(p):
     )
 
     if COMM.Get_rank() == 0:
+        # The gathered result keeps the dtype of a single serial solve
+        for executor, results in [
+            (executor_dense, results_dense),
+            (executor_sparse, results_sparse),
+        ]:
+            G = executor.solve(p["k"], w_grid[0], p["eta"])
+            assert results.dtype == G.dtype
+
         results_dense = (-results_dense.imag / np.pi).squeeze()
         results_sparse = (-results_sparse.imag / np.pi).squeeze()
 
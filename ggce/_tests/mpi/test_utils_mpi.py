@@ -0,0 +1,38 @@
+import time
+
+import pytest
+
+import numpy as np
+
+from ggce.utils.utils import dynamic_job_indices
+
+mpi4py_imported = False
+try:
+    from mpi4py import MPI
+
+    mpi4py_imported = True
+except ImportError:
+    pass
+
+
+@pytest.mark.skipif(not mpi4py_imported, reason="mpi4py not installed")
+@pytest.mark.mpi(min_size=2)
+def test_dynamic_job_indices_uneven_cost():
+    COMM = MPI.COMM_WORLD
+    rank = COMM.Get_rank()
+    n_jobs = 40
+
+    # Jobs on rank 0 are 50x slower than everywhere else. Ranks waiting on
+    # the dispatcher must not be held up by rank 0's jobs
+    delay = 0.5 if rank == 0 else 0.01
+    indices = []
+    for ii in dynamic_job_indices(n_jobs, COMM):
+        time.sleep(delay)
+        indices.append(ii)
+
+    all_indices = COMM.gather(indices, root=0)
+    if rank == 0:
+        assert np.array_equal(
+            np.sort(np.concatenate(all_indices)), np.arange(n_jobs)
+        )
+        assert len(all_indices[0]) <= n_jobs // 4
@@ -255,3 +255,27 @@ def test_res_chkpt(p):
     assert (results == results_disk).all()
 
     shutil.rmtree(root)
+
+
+def test_res_chkpt_pool(tmp_path, monkeypatch):
+    model = Model.from_parameters(**model_p["model_params"])
+    model.add_(**model_p["model_add_params"])
+    w_grid = np.linspace(-3, -2, 5)
+
+    # Completed writes are not kept around, and closing waits for them all
+    with SparseSolver(System(model), root=tmp_path / "ok") as executor:
+        for w in w_grid:
+            executor.solve(model_p["k"], w, model_p["eta"])
+    assert len(executor._checkpoint_futures) == 0
+    assert len(list(executor._results_directory.glob("*.pkl"))) == 5
+
+    # Failed writes are kept and their errors re-raised
+    def failing_write(G, path):
+        raise OSError("disk full")
+
+    executor = SparseSolver(System(model), root=tmp_path / "fail")
+    monkeypatch.setattr(executor, "_write_checkpoint", failing_write)
+    executor.solve(model_p["k"], w_grid[0], model_p["eta"])
+    with pytest.raises(OSError):
+        executor.close()
+    assert len(executor._checkpoint_futures) == 0
@@ -0,0 +1,123 @@
+import os
+
+import numpy as np
+
+from ggce.utils.utils import (
+    Buffer,
+    load_buffer,
+    find_remaining_jobs,
+    lorentzian,
+    peak_location_and_weight_wstep,
+    peak_location_and_weight_scipy,
+)
+
+
+def test_buffer_roundtrip(tmp_path):
+    records = []
+    with Buffer(3, tmp_path, rank=0) as b0, Buffer(3, tmp_path, rank=1) as b1:
+        for ii in range(7):
+            val = (0.1 * ii, -2.0 + ii, 1.5 * ii, -0.5 * ii, 1e-3, 10 + ii)
+            [b0, b1][ii % 2](val)
+            records.append(val)
+
+        # Only full buffers have been written to disk so far
+        assert len(load_buffer(tmp_path)) == 6
+
+    # Closing again is a no-op
+    b0.close()
+
+    loaded = load_buffer(tmp_path)
+    assert len(loaded) == len(records)
+    loaded = np.sort(loaded, order="k")
+    expected = np.array(records)
+    for ii, name in enumerate(["k", "w", "gr", "gi", "t", "d"]):
+        assert np.allclose(loaded[name], expected[:, ii])
+
+
+def test_buffer_short_writes(tmp_path, monkeypatch):
+    write = os.write
+
+    # Simulate os.write only ever writing part of what it is given
+    def short_write(fd, data):
+        return write(fd, data[:7])
+
+    monkeypatch.setattr(os, "write", short_write)
+    records = [(0.1 * ii, 1.0, 2.0, 3.0, 4.0, ii) for ii in range(5)]
+    with Buffer(2, tmp_path) as buffer:
+        for val in records:
+            buffer(val)
+
+    loaded = load_buffer(tmp_path)
+    assert len(loaded) == len(records)
+    assert np.allclose(loaded["d"], np.arange(5))
+
+
+def test_load_buffer_torn_record(tmp_path):
+    with Buffer(2, tmp_path) as buffer:
+        for ii in range(4):
+            buffer((0.1 * ii, 1.0, 2.0, 3.0, 4.0, ii))
+
+    # Simulate a crash partway through writing a record
+    with open(tmp_path / "rank00000.bin", "ab") as f:
+        f.write(b"\x00" * 10)
+
+    loaded = load_buffer(tmp_path)
+    assert len(loaded) == 4
+    assert np.allclose(loaded["d"], np.arange(4))
+
+
+def test_load_buffer_empty(tmp_path):
+    assert len(load_buffer(tmp_path)) == 0
+
+
+def test_find_remaining_jobs(tmp_path):
+    k = np.linspace(0.0, np.pi, 5)
+    w = np.linspace(-3.0, -2.0, 7)
+    jobs = [(_k, _w) for _k in k for _w in w]
+
+    with Buffer(4, tmp_path) as buffer:
+        for _k, _w in jobs[::3]:
+            buffer((_k, _w, 0.0, 0.0, 0.0, 1))
+
+    remaining = find_remaining_jobs(jobs, load_buffer(tmp_path))
+    expected = [job for ii, job in enumerate(jobs) if ii % 3 != 0]
+    assert isinstance(remaining, list)
+    assert all(isinstance(job, tuple) for job in remaining)
+    assert np.allclose(remaining, expected)
+
+    # Plain arrays of (k, w) points work too
+    remaining = find_remaining_jobs(jobs, jobs[1:] + [(10.0, 10.0)])
+    assert remaining == jobs[:1]
+    assert len(find_remaining_jobs(jobs, [])) == len(jobs)
+
+
+def test_lorentzian():
+    w = np.linspace(-3.0, -1.0, 101)
+    expected = 0.7 * (0.05 / np.pi) / ((w + 2.1) ** 2 + 0.05**2)
+    assert np.allclose(lorentzian(w, -2.1, 0.7, 0.05), expected)
+
+    fitparams, _ = peak_location_and_weight_scipy(
+        w[40:60], expected[40:60], 0.05
+    )
+    assert np.allclose(fitparams, [-2.1, 0.7, 0.05], atol=1e-6)
+
+
+def test_peak_location_and_weight_wstep():
+    eta = 0.05
+    loc = np.array([-2.3, -2.1, -1.9])
+    area = np.array([0.9, 0.7, 0.5])
+    w = loc - 0.2
+    wprime = loc - 0.1
+    A = lorentzian(w, loc, area, eta)
+    Aprime = lorentzian(wprime, loc, area, eta)
+
+    # All k at once agrees with one k at a time
+    locs, areas = peak_location_and_weight_wstep(w, wprime, A, Aprime, eta)
+    assert np.allclose(locs, loc)
+    assert np.allclose(areas, area)
+    for ii in range(len(loc)):
+        _loc, _area = peak_location_and_weight_wstep(
+            w[ii], wprime[ii], A[ii], Aprime[ii], eta
+        )
+        assert np.ndim(_loc) == 0
+        assert np.isclose(_loc, locs[ii]) and np.isclose(_area, areas[ii])
@@ -330,11 +330,8 @@ class System:
             obj = eval(f"self._{attr}")
             path = Path(self._root) / Path(f"{attr}.pkl")
             if obj is not None and not path.exists():
-                pickle.dump(
-                    obj,
-                    open(path, "wb"),
-                    protocol=pickle.HIGHEST_PROTOCOL,
-                )
+                with open(path, "wb") as f:
+                    pickle.dump(obj, f, protocol=pickle.HIGHEST_PROTOCOL)
                 logger.info(f"Checkpoint saved: {attr}")
 
     @classmethod
@@ -358,17 +355,20 @@ class System:
         generalized_equations = None
         path = Path(root) / Path("generalized_equations.pkl")
         if path.exists():
-            generalized_equations = pickle.load(open(path, "rb"))
+            with open(path, "rb") as f:
+                generalized_equations = pickle.load(f)
 
         f_arg_list = None
         path = Path(root) / Path("f_arg_list.pkl")
         if path.exists():
-            f_arg_list = pickle.load(open(path, "rb"))
+            with open(path, "rb") as f:
+                f_arg_list = pickle.load(f)
 
         equations = None
         path = Path(root) / Path("equations.pkl")
         if path.exists():
-            equations = pickle.load(open(path, "rb"))
+            with open(path, "rb") as f:
+                equations = pickle.load(f)
 
         return cls(
             model=model,
@@ -745,6 +745,19 @@ class Term(MSONable):
     def coefficient(self):
         raise NotImplementedError
 
+    def _exp_term(self, k):
+        """Returns the phase :math:`e^{i k a \\delta}`, where :math:`\\delta`
+        is the ``exp_shift``. It does not depend on the frequency, so the value
+        at the most recent ``k`` is cached and reused by consecutive (k, w)
+        points at the same momentum. This assumes ``exp_shift`` is no longer
+        modified once coefficients are being evaluated."""
+
+        if getattr(self, "_exp_term_k", None) != k:
+            exp_arg = 1j * np.dot(k, self._lattice_constant * self.exp_shift)
+            self._exp_term_value = cmath.exp(exp_arg)
+            self._exp_term_k = k
+        return self._exp_term_value
+
     def _modify_n_phonons_(self):
         """By default, does nothing, will only be defined for the terms
         in which we add or subtract a phonon."""
@@ -862,14 +875,12 @@ class EOMTerm(Term):
         constant prefactor), and this method will be overridden by
         AnnihilationTerm and CreationTerm classes."""
 
-        exp_arg = 1j * np.dot(k, self._lattice_constant * self.exp_shift)
-
         return (
             self._constant_prefactor
             * physics.G0_k_omega(
                 k, w, self._lattice_constant, eta, self._hopping
             )
-            * cmath.exp(exp_arg)
+            * self._exp_term(k)
         )
 
     def _increment_g_arg_(self, delta):
@@ -907,8 +918,7 @@ class NonIndexTerm(Term):
         self._modify_n_phonons_(*loc)
 
     def coefficient(self, k, w, eta):
-        exp_arg = 1j * np.dot(k, self._lattice_constant * self.exp_shift)
-        exp_term = cmath.exp(exp_arg)
+        exp_term = self._exp_term(k)
 
         w_freq_shift = w - self.freq_shift
 
@@ -166,9 +166,11 @@ class MassSolver(Solver):
         # Figure out what the given process owns
         self._rstart, self._rend = self._vector_b.getOwnershipRange()
         logger.debug(
-            f"I am rank {self.mpi_rank} in brigade "
-            f"{self.mpi_brigade} and got range "
-            f"{self._rstart} to {self._rend}"
+            "I am rank {} in brigade {} and got range {} to {}",
+            self.mpi_rank,
+            self.mpi_brigade,
+            self._rstart,
+            self._rend,
         )
 
         # Create the matrix for the linear problem
@@ -212,32 +214,19 @@ class MassSolver(Solver):
             the matrix that are nonzero.
         """
 
-        row_ind = []
-        col_ind = []
-        dat = []
-
-        total_bosons = np.sum(self._system.model.phonon_number)
-        for n_bosons in range(total_bosons + 1):
-            for eq in self._system.equations[n_bosons]:
-                row_dict = dict()
-                index_term_id = eq.index_term.id()
-                ii_basis = self._basis[index_term_id]
-
-                for term in eq._terms_list + [eq.index_term]:
-                    jj = self._basis[term.id()]
-                    try:
-                        row_dict[jj] += term.coefficient(k, w, eta)
-                    except KeyError:
-                        row_dict[jj] = term.coefficient(k, w, eta)
+        row_ind, col_ind, entries = self._get_sparsity_pattern()
 
-                row_ind.extend([ii_basis for _ in range(len(row_dict))])
-                col_ind.extend([key for key, _ in row_dict.items()])
-                dat.extend([value for _, value in row_dict.items()])
+        dat = []
+        for terms in entries:
+            value = terms[0].coefficient(k, w, eta)
+            for term in terms[1:]:
+                value += term.coefficient(k, w, eta)
+            dat.append(value)
 
         # estimate sparse matrix memory usage
         # (complex (16 bytes) + int (4 bytes) + int) * nonzero entries
         est_mem_used = 24 * len(dat) / BYTES_TO_GB
-        logger.debug(f"Estimated memory needed is {est_mem_used:.02f} MB")
+        logger.debug("Estimated memory needed is {:.02f} MB", est_mem_used)
 
         return row_ind, col_ind, dat
 
@@ -403,8 +392,10 @@ class MassSolver(Solver):
             if self._rstart <= row_coo and row_coo < self._rend:
                 row_start, col_pos, val = row_coo, col_ind[ii], dat[ii]
                 logger.debug(
-                    f"I am rank {self.mpi_rank} and I am setting"
-                    f" the values at {(row_start, col_pos)}"
+                    "I am rank {} and I am setting the values at ({}, {})",
+                    self.mpi_rank,
+                    row_start,
+                    col_pos,
                 )
                 self._mat_X.setValues(row_start, col_pos, val)
 
@@ -427,7 +418,8 @@ class MassSolver(Solver):
 
         dt = time.time() - t0
         logger.debug(
-            f"PETSc matrix assembled, built from disk at: {self._matr_dir}",
+            "PETSc matrix assembled, built from disk at: {}",
+            self._matr_dir,
             elapsed=dt,
         )
 
@@ -516,8 +508,9 @@ class MassSolver(Solver):
             )
             k, w = padded_kw(k, w, self.brigades)
 
-        # Generate a list of tuples for the (k, w) points to calculate.
-        jobs = [(_k, _w) for _k in k for _w in w]
+        # Generate an array of the (k, w) points to calculate.
+        K, W = np.meshgrid(k, w, indexing="ij")
+        jobs = np.column_stack((K.ravel(), W.ravel()))
 
         # check if working from disk or computing matrices on the fly
         if self._matr_dir is not None:
@@ -550,29 +543,37 @@ class MassSolver(Solver):
         # need to get rid of duplicates, since each rank in a brigade sends
         # a copy of the results from the brigade
         if self.mpi_rank == 0:
-            results = []
-            if self.brigade_size > 1:
-                for n in range(self.brigades):
-                    results.append(all_results[int(n * self.brigade_size)])
-            else:
-                results = all_results
-
-            results = [xx[ii] for xx in results for ii in range(len(xx))]
-
-            # a copy of the results of the whole brigade
-            s = [xx[0] for xx in results]
-            meta = [xx[1] for xx in results]
-            res = np.array(s)
-
-            # remove nans from the padding
-            res = res[~np.isnan(res)]
+            results = all_results[:: self.brigade_size]
+
+            # a copy of the results of the whole brigade, copied in a single
+            # pass into a preallocated array
+            res = np.empty(sum(len(xx) for xx in results), dtype=np.complex128)
+            meta = []
+            ii = 0
+            for brigade_results in results:
+                for G, info in brigade_results:
+                    res[ii] = G
+                    meta.append(info)
+                    ii += 1
+
+            # remove nans from the padding, applying the same mask to the jobs
+            # so that any reported (k, w) matches the offending point
+            mask = ~np.isnan(res)
+            res = res[mask]
+            self._check_spectral_function(
+                res, jobs[mask, 0], jobs[mask, 1]
+            )
 
             # Ensure the returned array has the proper shape
             res = res.reshape(len(k), len(w))
 
         # Broadcast the final result to all ranks
         # memory intensive but intuitive
-        res = self._mpi_comm.bcast(res, root=0)
+        if self.mpi_rank == 0:
+            res = np.ascontiguousarray(res, dtype=np.complex128)
+        else:
+            res = np.empty((len(k), len(w)), dtype=np.complex128)
+        self._mpi_comm.Bcast(res, root=0)
         meta = self._mpi_comm.bcast(meta, root=0)
 
         if return_meta:
@@ -641,8 +642,9 @@ class MassSolver(Solver):
             )
             k, w = padded_kw(k, w, self.brigades)
 
-        # Generate a list of tuples for the (k, w) points to calculate.
-        jobs = [(_k, _w) for _k in k for _w in w]
+        # Generate an array of the (k, w) points to calculate.
+        K, W = np.meshgrid(k, w, indexing="ij")
+        jobs = np.column_stack((K.ravel(), W.ravel()))
 
         # Chunk the jobs appropriately. Each of these lists look like the jobs
         # list above.
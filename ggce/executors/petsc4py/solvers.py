@@ -52,7 +52,8 @@ class MassSolverMUMPS(MassSolver):
             if self.mumps_conv_ind == 0:
                 logger.debug(
                     "According to MUMPS diagnostics, call to MUMPS was "
-                    f"successful. The calculation took {elapsed:.2f} sec."
+                    "successful. The calculation took {:.2f} sec.",
+                    elapsed,
                 )
             elif self.mumps_conv_ind < 0:
                 logger.error(
@@ -88,7 +89,7 @@ class MassSolverMUMPS(MassSolver):
         # Each rank reports their memory usage (in millions of bytes)
         self.rank_mem_used = factored_mat.getMumpsInfo(26) * 1e6 / BYTES_TO_GB
         logger.debug(
-            f"Current rank MUMPS memory usage is {self.rank_mem_used:.02f} GB"
+            "Current rank MUMPS memory usage is {:.02f} GB", self.rank_mem_used
         )
 
         # set up memory usage tracking, report to the logger on head node only
@@ -98,7 +99,7 @@ class MassSolverMUMPS(MassSolver):
         )
         if self.mpi_rank == 0:
             logger.debug(
-                f"Total MUMPS memory usage is {self.total_mem_used:.02f} GB"
+                "Total MUMPS memory usage is {:.02f} GB", self.total_mem_used
             )
 
     def _pre_solve(self, k, w, eta):
@@ -108,14 +109,14 @@ class MassSolverMUMPS(MassSolver):
             ckpt_path = f"{self._k_omega_eta_to_str(k, w, eta)}.pkl"
             path = self._results_directory / Path(ckpt_path)
             if path.exists():
-                result = np.array(pickle.load(open(path, "rb")))
+                with open(path, "rb") as f:
+                    result = np.array(pickle.load(f))
         return result, path
 
     def _post_solve(self, G, k, w, path):
-        if -G.imag / np.pi < 0.0:
-            logger.error(f"A(k,w) < 0 at k, w = ({k:.02f}, {w:.02f}")
         if self._results_directory is not None:
-            pickle.dump(G, open(path, "wb"), protocol=pickle.HIGHEST_PROTOCOL)
+            with open(path, "wb") as f:
+                pickle.dump(G, f, protocol=pickle.HIGHEST_PROTOCOL)
 
     def solve(self, k, w, eta, rtol=1.0e-10):
         """Solve the sparse-represented system using PETSc's KSP context.
@@ -193,18 +194,16 @@ class MassSolverMUMPS(MassSolver):
         # now check memory usage
         self.check_mem_use(factored_mat)
 
-        self._mpi_comm_brigadier.barrier()
-
         # for memory management, destroy the KSP context manually
         ksp.destroy()
 
         # The last rank has the end of the solution vector, which contains G
-        # G is the last entry aka "the last equation" of the matrix
-        # use a gather operation, called by all ranks, to construct the full
-        # vector (currently not used but will be later)
-        G_vec = self._mpi_comm_brigadier.gather(
-            self._vector_x.getArray(), root=0
-        )
+        # G is the last entry aka "the last equation" of the matrix. Only
+        # that entry is needed, so it is broadcast as a typed buffer from the
+        # last rank rather than gathering the full vector as Python objects
+        G_buf = np.empty(1, dtype=np.complex128)
+        if self.brigade_rank == self.brigade_size - 1:
+            G_buf[0] = self._vector_x.getArray()[-1]
 
         # since we grabbed the Green's func value, destroy the data structs
         # not strictly necessary
@@ -212,16 +211,9 @@ class MassSolverMUMPS(MassSolver):
         self._vector_b.destroy()
         self._mat_X.destroy()
 
-        # Now select only the final value from the array
-        if self.brigade_rank == 0:
-            G_val = G_vec[self.brigade_size - 1][-1]
-        else:
-            G_val = None
-
         # and bcast to all processes in your brigade
-        # self._mpi_comm_brigadier.Barrier()
-        # self._mpi_comm.Abort()
-        G_val = self._mpi_comm_brigadier.bcast(G_val, root=0)
+        self._mpi_comm_brigadier.Bcast(G_buf, root=self.brigade_size - 1)
+        G_val = G_buf[0]
 
         # only checkpoint if you are the brigade commander
         if self.brigade_rank == 0:
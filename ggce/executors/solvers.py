@@ -1,4 +1,6 @@
 from abc import ABC, abstractmethod
+from concurrent.futures import ThreadPoolExecutor
+import os
 from pathlib import Path
 import pickle
 import warnings
@@ -10,7 +12,7 @@ from scipy.sparse.linalg import spsolve
 from tqdm import tqdm
 
 from ggce.logger import logger, disable_logger
-from ggce.utils.utils import float_to_list, chunk_jobs
+from ggce.utils.utils import float_to_list, dynamic_job_indices
 from ggce.engine.system import System
 from ggce.utils.physics import G0_k_omega
 
@@ -73,6 +75,11 @@ class Solver(ABC):
             # will now be initialized or an error will be thrown
             self._system = System.from_checkpoint(self._root)
 
+        # Constant for the lifetime of the solver, so it is computed once
+        # rather than at every (k, w) point
+        self._total_phonons = np.sum(self._system.model.phonon_number)
+        self._sparsity_pattern = None
+
         # Force checkpoint the system, which at this point must be initialized
         with disable_logger():
             self._system.checkpoint()
@@ -80,26 +87,97 @@ class Solver(ABC):
         if self._root is not None:
             logger.info(f"System checkpointed to '/{self._root}'")
 
-    def get_jobs_on_this_rank(self, jobs):
-        """Gets the jobs assigned to this rank. Note this method silently
-        behaves as it should when the world size is 1 (or there's no MPI
-        communicator).
+    def get_jobs_on_this_rank(self, n_jobs):
+        """Gets the indices of the jobs assigned to this rank. Jobs are
+        dispensed dynamically one at a time from a counter shared by all ranks
+        (see :func:`ggce.utils.utils.dynamic_job_indices`), so this method
+        must be iterated to completion on every rank. Note this method
+        silently behaves as it should when the world size is 1 (or there's no
+        MPI communicator).
 
         Parameters
         ----------
-        jobs : list
-            The jobs to chunk.
+        n_jobs : int
+            The total number of jobs to distribute.
+
+        Yields
+        ------
+        int
+            The index of the job.
+        """
+
+        if self.mpi_comm is None or self.mpi_world_size == 1:
+            yield from range(n_jobs)
+            return
+
+        yield from dynamic_job_indices(n_jobs, self.mpi_comm)
+
+    def _get_sparsity_pattern(self):
+        """Gets the row and column coordinates of the nonzero entries of the
+        full-basis matrix, together with the terms contributing to each entry.
+        These depend only on the system, so they are computed once on the first
+        call and reused for every (k, w) point.
 
         Returns
         -------
-        list
-            The jobs assigned to this rank.
+        list, list, list
+            The row and column coordinate lists, and for each nonzero entry a
+            list of the terms whose coefficients sum to its value.
         """
 
-        if self.mpi_comm is None:
-            return jobs
+        if self._sparsity_pattern is not None:
+            return self._sparsity_pattern
+
+        row_ind = []
+        col_ind = []
+        entries = []
+
+        for n_bosons in range(self._total_phonons + 1):
+            for eq in self._system.equations[n_bosons]:
+                row_dict = dict()
+                index_term_id = eq.index_term.id()
+                ii_basis = self._basis[index_term_id]
+
+                for term in eq._terms_list + [eq.index_term]:
+                    jj = self._basis[term.id()]
+                    try:
+                        row_dict[jj].append(term)
+                    except KeyError:
+                        row_dict[jj] = [term]
+
+                row_ind.extend([ii_basis for _ in range(len(row_dict))])
+                col_ind.extend([key for key, _ in row_dict.items()])
+                entries.extend([value for _, value in row_dict.items()])
 
-        return chunk_jobs(jobs, self.mpi_world_size, self.mpi_rank)
+        self._sparsity_pattern = (row_ind, col_ind, entries)
+        return self._sparsity_pattern
+
+    @staticmethod
+    def _check_spectral_function(G, k, w):
+        """Logs a single error if the spectral function is negative anywhere
+        on the grid. This is done once on the full result rather than after
+        every (k, w) point.
+
+        Parameters
+        ----------
+        G : numpy.ndarray
+            The Green's function, flattened in the same order as ``k`` and
+            ``w``.
+        k, w : numpy.ndarray
+            The momentum and frequency of every point.
+        """
+
+        negative = np.where(-G.imag / np.pi < 0.0)[0]
+        if len(negative) > 0:
+            ii = negative[0]
+            logger.error(
+                "A(k,w) < 0 at {} of {} points, first at k, w = "
+                "({:.02f}, {:.02f})",
+                len(negative),
+                len(G),
+                k[ii],
+                w[ii],
+            )
 
     @staticmethod
     def _k_omega_eta_to_str(k, omega, eta):
@@ -125,6 +203,58 @@ class Solver(ABC):
 
 
 class BasicSolver(Solver):
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+
+        # Checkpoints are written by a background thread so that the file I/O
+        # overlaps with solving the next (k, w) point. Only writes which are
+        # pending or have failed are kept track of
+        self._checkpoint_pool = ThreadPoolExecutor(max_workers=1)
+        self._checkpoint_futures = set()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    @staticmethod
+    def _write_checkpoint(G, path):
+        # Write to a temporary file first so that a partially written
+        # checkpoint is never picked up by _pre_solve
+        tmp_path = path.with_suffix(".tmp")
+        with open(tmp_path, "wb") as f:
+            pickle.dump(G, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp_path, path)
+
+    def _checkpoint_done(self, future):
+        # Called when a write finishes. Failed writes are logged right away
+        # and kept so that wait_for_checkpoints re-raises the error
+        error = future.exception()
+        if error is None:
+            self._checkpoint_futures.discard(future)
+        else:
+            logger.error("Failed to write checkpoint: {}", error)
+
+    def wait_for_checkpoints(self):
+        """Blocks until every checkpoint submitted so far has been written to
+        disk, re-raising any error encountered while writing."""
+
+        for future in list(self._checkpoint_futures):
+            self._checkpoint_futures.discard(future)
+            future.result()
+
+    def close(self):
+        """Waits for all pending checkpoints to be written and then shuts
+        down the thread writing them. This is called automatically when the
+        solver is used as a context manager. The solver should not be used
+        to solve new points after it is closed."""
+
+        try:
+            self.wait_for_checkpoints()
+        finally:
+            self._checkpoint_pool.shutdown()
+
     def _pre_solve(self, k, w, eta):
         result = None
         path = None
@@ -132,14 +262,17 @@ class BasicSolver(Solver):
             ckpt_path = f"{self._k_omega_eta_to_str(k, w, eta)}.pkl"
             path = self._results_directory / Path(ckpt_path)
             if path.exists():
-                result = np.array(pickle.load(open(path, "rb")))
+                with open(path, "rb") as f:
+                    result = np.array(pickle.load(f))
         return result, path
 
     def _post_solve(self, G, k, w, path):
-        if -G.imag / np.pi < 0.0:
-            logger.error(f"A(k,w) < 0 at k, w = ({k:.02f}, {w:.02f}")
         if self._results_directory is not None:
-            pickle.dump(G, open(path, "wb"), protocol=pickle.HIGHEST_PROTOCOL)
+            future = self._checkpoint_pool.submit(
+                self._write_checkpoint, G, path
+            )
+            self._checkpoint_futures.add(future)
+            future.add_done_callback(self._checkpoint_done)
 
     def greens_function(self, k, w, eta, pbar=False):
         """Solves for the greens_function in serial or in parallel, depending
@@ -153,6 +286,12 @@ class BasicSolver(Solver):
             The frequency grid point of the calculation.
         eta : float
             The artificial broadening parameter of the calculation.
+        pbar : bool, optional
+            Shows a progress bar if True (the default is False). When running
+            on more than one rank, jobs are dispensed dynamically, so the
+            number each rank will run is not known in advance. Each rank's bar
+            then counts the jobs it has completed against the total number
+            of jobs.
 
         Returns
         -------
@@ -165,29 +304,65 @@ class BasicSolver(Solver):
 
         # This orders the jobs such that when constructed into an array, the
         # k-points are the rows and the w-points are the columns after reshape
-        jobs = [(_k, _w) for _k in k for _w in w]
-        jobs_on_rank = self.get_jobs_on_this_rank(jobs)
+        K, W = np.meshgrid(k, w, indexing="ij")
+        K, W = K.ravel(), W.ravel()
+        jobs_on_rank = self.get_jobs_on_this_rank(len(K))
 
+        indices = []
         s = []
-        for _k, _w in tqdm(jobs_on_rank, disable=not pbar):
-            s.append(self.solve(_k, _w, eta))
+        for ii in tqdm(jobs_on_rank, total=len(K), disable=not pbar):
+            indices.append(ii)
+            s.append(self.solve(K[ii], W[ii], eta))
+
+        self.wait_for_checkpoints()
 
         if self.mpi_comm is not None:
-            all_results = self.mpi_comm.gather(s, root=0)
+            # The results are gathered as typed buffers rather than pickled
+            # Python objects. Each rank first reports how many results it has
+            # and their dtype as a type code (0 if it has none), so that the
+            # result has the same dtype as it would in serial
+            indices = np.array(indices, dtype=np.int64)
+            values = np.array(s, dtype=np.complex128)
+            code = ord(np.result_type(*s).char) if len(s) > 0 else 0
+            info = None
+            if self.mpi_rank == 0:
+                info = np.empty((self.mpi_world_size, 2), dtype=np.int64)
+            self.mpi_comm.Gather(
+                np.array([len(values), code], dtype=np.int64), info, root=0
+            )
 
-            # Only rank 0 returns the result
+            all_indices = None
+            all_values = None
             if self.mpi_rank == 0:
-                # all_results is a list of arrays of different length
-                # need to parse it properly into an array
-                all_results = [
-                    xx[ii] for xx in all_results for ii in range(len(xx))
-                ]
-                s = np.array([xx for xx in all_results])
-                return s.reshape(len(k), len(w))
-            else:
+                counts = info[:, 0]
+                all_indices = np.empty(counts.sum(), dtype=np.int64)
+                all_values = np.empty(counts.sum(), dtype=np.complex128)
+            self.mpi_comm.Gatherv(
+                indices,
+                None if all_indices is None else [all_indices, counts],
+                root=0,
+            )
+            self.mpi_comm.Gatherv(
+                values,
+                None if all_values is None else [all_values, counts],
+                root=0,
+            )
+
+            # Only rank 0 returns the result
+            if self.mpi_rank != 0:
                 return None
 
-        return np.array(s).reshape(len(k), len(w))
+            # Jobs were dispensed dynamically, so the results need to be
+            # put back into the original order of the jobs list. Every index
+            # appears exactly once, so they can be placed directly without
+            # sorting
+            dtype = np.result_type(*[chr(c) for c in info[:, 1] if c > 0])
+            s = np.empty(len(all_values), dtype=dtype)
+            s[all_indices] = all_values
+
+        s = np.array(s)
+        self._check_spectral_function(s, K, W)
+        return s.reshape(len(k), len(w))
 
 
 class SparseSolver(BasicSolver):
@@ -210,6 +385,7 @@ class SparseSolver(BasicSolver):
         super().__init__(*args, **kwargs)
         if self._basis is None:
             self._basis = self._system.get_basis(full_basis=True)
+        self._green_index = self._basis["{G}[0.0]"]
 
     def _sparse_matrix_from_equations(self, k, w, eta):
         """This function iterates through the GGCE equations dicts to extract
@@ -234,32 +410,19 @@ class SparseSolver(BasicSolver):
             the matrix that are nonzero.
         """
 
-        row_ind = []
-        col_ind = []
-        dat = []
-
-        total_bosons = np.sum(self._system.model.phonon_number)
-        for n_bosons in range(total_bosons + 1):
-            for eq in self._system.equations[n_bosons]:
-                row_dict = dict()
-                index_term_id = eq.index_term.id()
-                ii_basis = self._basis[index_term_id]
-
-                for term in eq._terms_list + [eq.index_term]:
-                    jj = self._basis[term.id()]
-                    try:
-                        row_dict[jj] += term.coefficient(k, w, eta)
-                    except KeyError:
-                        row_dict[jj] = term.coefficient(k, w, eta)
+        row_ind, col_ind, entries = self._get_sparsity_pattern()
 
-                row_ind.extend([ii_basis for _ in range(len(row_dict))])
-                col_ind.extend([key for key, _ in row_dict.items()])
-                dat.extend([value for _, value in row_dict.items()])
+        dat = []
+        for terms in entries:
+            value = terms[0].coefficient(k, w, eta)
+            for term in terms[1:]:
+                value += term.coefficient(k, w, eta)
+            dat.append(value)
 
         # estimate sparse matrix memory usage
         # (complex (16 bytes) + int (4 bytes) + int) * nonzero entries
         est_mem_used = 24 * len(dat) / BYTES_TO_MB
-        logger.debug(f"Estimated memory needed is {est_mem_used:.02f} MB")
+        logger.debug("Estimated memory needed is {:.02f} MB", est_mem_used)
 
         return row_ind, col_ind, dat
 
@@ -294,11 +457,11 @@ class SparseSolver(BasicSolver):
 
         size = (X.data.size + X.indptr.size + X.indices.size) / BYTES_TO_MB
 
-        logger.debug(f"Memory usage of sparse X is {size:.01f} MB")
+        logger.debug("Memory usage of sparse X is {:.01f} MB", size)
 
         # Initialize the corresponding sparse vector
         # {G}(0)
-        row_ind = np.array([self._basis["{G}[0.0]"]])
+        row_ind = np.array([self._green_index])
         col_ind = np.array([0])
         v = coo_matrix(
             (
@@ -339,7 +502,7 @@ class SparseSolver(BasicSolver):
         # Solution ------------------------------------------------------------
         X, v = self._scaffold(k, w, eta)
         res = spsolve(X, v)
-        G = res[self._basis["{G}[0.0]"]]
+        G = res[self._green_index]
         # Solution Done -------------------------------------------------------
 
         self._post_solve(G, k, w, path)
@@ -368,18 +531,26 @@ class DenseSolver(BasicSolver):
         super().__init__(*args, **kwargs)
         if self._basis is None:
             self._basis = self._system.get_basis(full_basis=False)
+        self._fill_patterns = dict()
+
+    def _get_fill_pattern(self, n_phonons, shift):
+        """Gets the shape of the matrix coupling the ``n_phonons`` manifold to
+        the ``n_phonons + shift`` manifold, and the ``(row, column, term)``
+        triples that fill it. These depend only on the system, so they are
+        computed once per manifold pair and reused for every (k, w) point."""
+
+        key = (n_phonons, shift)
+        if key in self._fill_patterns:
+            return self._fill_patterns[key]
 
-    def _fill_matrix(self, k, w, n_phonons, shift, eta):
         n_phonons_shift = n_phonons + shift
 
         equations_n = self._system.equations[n_phonons]
 
-        # Initialize a matrix to fill
         d1 = len(self._basis[n_phonons])
         d2 = len(self._basis[n_phonons + shift])
-        A = np.zeros((d1, d2), dtype=np.complex64)
 
-        # Fill the matrix of coefficients
+        entries = []
         for ii, eq in enumerate(equations_n):
             index_term_id = eq.index_term.id()
             ii_basis = self._basis[n_phonons][index_term_id]
@@ -388,7 +559,20 @@ class DenseSolver(BasicSolver):
                     continue
                 t_id = term.id()
                 jj_basis = self._basis[n_phonons_shift][t_id]
-                A[ii_basis, jj_basis] += term.coefficient(k, w, eta)
+                entries.append((ii_basis, jj_basis, term))
+
+        self._fill_patterns[key] = (d1, d2, entries)
+        return self._fill_patterns[key]
+
+    def _fill_matrix(self, k, w, n_phonons, shift, eta):
+        d1, d2, entries = self._get_fill_pattern(n_phonons, shift)
+
+        # Initialize a matrix to fill
+        A = np.zeros((d1, d2), dtype=np.complex64)
+
+        # Fill the matrix of coefficients
+        for ii_basis, jj_basis, term in entries:
+            A[ii_basis, jj_basis] += term.coefficient(k, w, eta)
 
         return A
 
@@ -421,7 +605,7 @@ class DenseSolver(BasicSolver):
             return result
 
         # Solution ------------------------------------------------------------
-        total_phonons = np.sum(self._system.model.phonon_number)
+        total_phonons = self._total_phonons
         for n_phonons in range(total_phonons, 0, -1):
             # Special case of the recursion where R_N = alpha_N.
             if n_phonons == total_phonons:
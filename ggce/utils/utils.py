@@ -1,38 +1,285 @@
 from contextlib import contextmanager
+import os
 from pathlib import Path
+import threading
 import time
-import uuid
 
 import numpy as np
-import pickle
 from scipy.optimize import curve_fit
 
+try:
+    from mpi4py import MPI
+except ImportError:
+    MPI = None
+
+
+# Each record written by the Buffer is (k, w, G.real, G.imag, time, dim)
+BUFFER_DTYPE = np.dtype(
+    [
+        ("k", "<f8"),
+        ("w", "<f8"),
+        ("gr", "<f8"),
+        ("gi", "<f8"),
+        ("t", "<f8"),
+        ("d", "<i8"),
+    ]
+)
+
 
 class Buffer:
-    def __init__(self, nbuff, target_directory):
+    """Accumulates fixed-width result records in memory and appends them to
+    a single binary log per rank, ``rank{rank:05}.bin``, every ``nbuff``
+    calls. The log can be read back in one shot with :func:`load_buffer`.
+    The underlying file descriptor is released by :meth:`close`, which is
+    also called when the buffer is used as a context manager.
+
+    .. hint::
+
+        Here's an example::
+
+            with Buffer(100, directory, rank=rank) as buffer:
+                for val in results:
+                    buffer(val)
+
+    Parameters
+    ----------
+    nbuff : int
+        The number of records to hold in memory before flushing to disk.
+    target_directory : os.PathLike
+        The directory in which the log is written.
+    rank : int, optional
+        The MPI rank owning this buffer (the default is 0).
+    """
+
+    def __init__(self, nbuff, target_directory, rank=0):
         self.nbuff = nbuff
         self.counter = 0
-        self.queue = []
+        self.rank = rank
         self.target_directory = Path(target_directory)
+        self.path = self.target_directory / Path(f"rank{rank:05}.bin")
+        self.buf = np.empty(nbuff, dtype=BUFFER_DTYPE)
+        self.fd = os.open(
+            self.path, os.O_WRONLY | os.O_CREAT | os.O_APPEND, 0o644
+        )
 
     def flush(self):
         if self.counter > 0:
-            path = self.target_directory / Path(f"{uuid.uuid4().hex}.pkl")
-            pickle.dump(self.queue, open(path, "wb"), protocol=4)
+            # os.write may write fewer bytes than requested, so keep writing
+            # until the whole buffer is on disk. Dropping the tail would
+            # misalign every subsequent record in the log
+            data = memoryview(self.buf[: self.counter]).cast("B")
+            while len(data) > 0:
+                data = data[os.write(self.fd, data) :]
             self.counter = 0
-            self.queue = []
+
+    def close(self):
+        if self.fd is None:
+            return
+        self.flush()
+        os.close(self.fd)
+        self.fd = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
 
     def __call__(self, val):
-        self.queue.append(val)
+        self.buf[self.counter] = tuple(val)
         self.counter += 1
         if self.counter >= self.nbuff:
             self.flush()
 
 
+def load_buffer(target_directory):
+    """Reads every per-rank log written by :class:`Buffer` in
+    ``target_directory``.
+
+    Parameters
+    ----------
+    target_directory : os.PathLike
+
+    Returns
+    -------
+    numpy.ndarray
+        A structured array of dtype ``BUFFER_DTYPE`` containing all records.
+        If there is only a single log, it is returned as a read-only memory
+        map so that records are only paged in when accessed.
+    """
+
+    # Only complete records are mapped, so that a torn record at the end of
+    # a log (e.g. from a crash mid-flush) is ignored
+    shards = []
+    for path in sorted(Path(target_directory).glob("rank*.bin")):
+        n_records = path.stat().st_size // BUFFER_DTYPE.itemsize
+        if n_records > 0:
+            shards.append(
+                np.memmap(
+                    path, dtype=BUFFER_DTYPE, mode="r", shape=(n_records,)
+                )
+            )
+    if len(shards) == 0:
+        return np.empty(0, dtype=BUFFER_DTYPE)
+    if len(shards) == 1:
+        return shards[0]
+
+    # Copy each shard straight into the output without any intermediate
+    # in-memory copies of the shards themselves
+    loaded = np.empty(sum(len(shard) for shard in shards), dtype=BUFFER_DTYPE)
+    ii = 0
+    for shard in shards:
+        loaded[ii : ii + len(shard)] = shard
+        ii += len(shard)
+    return loaded
+
+
+def _job_keys(k, w, decimals=8):
+    """Encodes each (k, w) pair as a single complex key so that set
+    operations can be performed by NumPy rather than on Python tuples."""
+
+    return np.round(k, decimals) + 1j * np.round(w, decimals)
+
+
+def find_remaining_jobs(jobs, completed):
+    """Removes the completed (k, w) points from a list of jobs.
+
+    Parameters
+    ----------
+    jobs : array_like
+        The (k, w) points to calculate, of shape ``(N, 2)``.
+    completed : array_like
+        Either a structured array as returned by :func:`load_buffer` or the
+        completed (k, w) points, of shape ``(M, 2)``.
+
+    Returns
+    -------
+    list
+        The (k, w) tuples not contained in ``completed``, in their original
+        order.
+    """
+
+    jobs = np.asarray(jobs, dtype=np.float64).reshape(-1, 2)
+    completed = np.asarray(completed)
+    if completed.dtype.names is not None:
+        done_k, done_w = completed["k"], completed["w"]
+    else:
+        completed = completed.astype(np.float64).reshape(-1, 2)
+        done_k, done_w = completed[:, 0], completed[:, 1]
+
+    keys = _job_keys(jobs[:, 0], jobs[:, 1])
+    done_keys = _job_keys(done_k, done_w)
+    return [tuple(job) for job in jobs[~np.isin(keys, done_keys)].tolist()]
+
+
 def chunk_jobs(jobs, world_size, rank):
     return np.array_split(jobs, world_size)[rank].tolist()
 
 
+def _serve_job_indices(n_jobs, comm, poll_interval):
+    """Runs on rank 0: hands out job indices from a local counter to itself
+    and, from a background dispatcher thread, to every other rank on
+    request."""
+
+    lock = threading.Lock()
+    counter = 0
+    errors = []
+
+    def next_index():
+        nonlocal counter
+        with lock:
+            index = counter
+            counter += 1
+        return index
+
+    def dispatch():
+        n_workers = comm.Get_size() - 1
+        request = np.empty(1, dtype=np.int64)
+        reply = np.empty(1, dtype=np.int64)
+        status = MPI.Status()
+        try:
+            while n_workers > 0:
+                # Poll rather than block in Recv, since a blocking receive
+                # busy-waits and would steal a core from rank 0's own jobs
+                req = comm.Irecv(request, source=MPI.ANY_SOURCE)
+                while not req.Test(status):
+                    time.sleep(poll_interval)
+                reply[0] = next_index()
+                comm.Send(reply, dest=status.Get_source())
+                if reply[0] >= n_jobs:
+                    n_workers -= 1
+        except Exception as error:
+            errors.append(error)
+
+    # Without full thread support rank 0 cannot solve jobs while the
+    # dispatcher runs, so it only dispatches
+    if MPI.Query_thread() < MPI.THREAD_MULTIPLE:
+        dispatch()
+    else:
+        thread = threading.Thread(target=dispatch, daemon=True)
+        thread.start()
+        while True:
+            index = next_index()
+            if index >= n_jobs:
+                break
+            yield index
+        thread.join()
+
+    if errors:
+        raise errors[0]
+
+
+def _request_job_indices(n_jobs, comm):
+    """Runs on ranks other than 0: requests job indices from the dispatcher
+    one at a time until they run out."""
+
+    request = np.zeros(1, dtype=np.int64)
+    index = np.empty(1, dtype=np.int64)
+    while True:
+        comm.Send(request, dest=0)
+        comm.Recv(index, source=0)
+        if index[0] >= n_jobs:
+            break
+        yield int(index[0])
+
+
+def dynamic_job_indices(n_jobs, comm, poll_interval=1e-3):
+    """Yields the indices of the jobs to run on this rank. Rather than
+    assigning each rank a fixed chunk up front, indices are handed out one at
+    a time by a dispatcher on rank 0, so that ranks which finish early (e.g.
+    because their points were reloaded from checkpoints, or are cheaper to
+    solve) keep picking up work. The dispatcher runs in its own thread, so
+    requests are answered even while rank 0 is busy solving its own jobs.
+    If MPI does not provide ``MPI.THREAD_MULTIPLE``, rank 0 only dispatches
+    and runs no jobs itself. Every rank in ``comm`` must exhaust the
+    generator, since it communicates over a duplicate of ``comm`` which is
+    freed collectively.
+
+    Parameters
+    ----------
+    n_jobs : int
+        The total number of jobs.
+    comm : mpi4py.MPI.Comm
+        The communicator over which the jobs are distributed.
+    poll_interval : float, optional
+        The time in seconds the dispatcher sleeps between checks for new
+        requests (the default is 1e-3).
+
+    Yields
+    ------
+    int
+    """
+
+    # A private communicator keeps the requests from ever matching other
+    # messages sent over comm
+    comm = comm.Dup()
+    if comm.Get_rank() == 0:
+        yield from _serve_job_indices(n_jobs, comm, poll_interval)
+    else:
+        yield from _request_job_indices(n_jobs, comm)
+    comm.Free()
+
+
 def padded_kw(k, w, num_brig, ext=1000):
     """For two arrays of given width and chunk size,
     this gives the optimal padding amount. ext
@@ -161,7 +408,9 @@ def peak_location_and_weight_wstep(w, wprime, A, Aprime, eta):
     """Takes two points (w, A) and (wprime, Aprime) from the same eta
     calculation and assumes they lie on the same Lorentzian of the form
     f(x) = C (eta/pi) / ( eta**2 + (x-loc)**2 ). Solves the equation to fit
-    a Lorentzian through those two points by determining C, x0."""
+    a Lorentzian through those two points by determining C, x0. The inputs
+    may also be arrays, e.g. one pair of points per k, in which case all of
+    the peaks are located at once."""
 
     firstterm = A * Aprime * (w - wprime) ** 2 / (A - Aprime) ** 2
     secondterm = eta**2
@@ -173,10 +422,31 @@ def peak_location_and_weight_wstep(w, wprime, A, Aprime, eta):
     )
     area1 = np.pi * A * ((w - loc1) ** 2 + eta**2) / eta
     area2 = np.pi * A * ((w - loc2) ** 2 + eta**2) / eta
-    if area1 > 1.0:
-        return loc2, area2
-    else:
-        return loc1, area1
+    use_second = area1 > 1.0
+    loc = np.where(use_second, loc2, loc1)[()]
+    area = np.where(use_second, area2, area1)[()]
+    return loc, area
+
+
+# The Lorentzian passed to curve_fit, set on first use
+_fit_lorentzian = None
+
+
+def _get_fit_lorentzian():
+    """Returns the Lorentzian used by ``curve_fit``, compiled with numba on
+    first use when it is installed. numba is imported here rather than at
+    the top of the module since importing it is slow and only pays off when
+    fitting."""
+
+    global _fit_lorentzian
+    if _fit_lorentzian is None:
+        try:
+            from numba import njit
+        except ImportError:
+            _fit_lorentzian = lorentzian
+        else:
+            _fit_lorentzian = njit(cache=True, fastmath=True)(lorentzian)
+    return _fit_lorentzian
 
 
 def peak_location_and_weight_scipy(wrange, Arange, eta):
@@ -184,7 +454,7 @@ def peak_location_and_weight_scipy(wrange, Arange, eta):
     fit of a Lorentzian function to it. Outputs fit parameters and error."""
 
     fitparams, error = curve_fit(
-        lorentzian, wrange, Arange, p0=[wrange[-1], 1, eta]
+        _get_fit_lorentzian(), wrange, Arange, p0=[wrange[-1], 1, eta]
     )
 
     return fitparams, error